@@ -3,7 +3,6 @@ This module provides a ComsolCom interface with enhanced features.
 """
 
 import functools
-import inspect
 import logging
 import os
 
@@ -15,6 +14,10 @@ from . import error
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+# The (version, mtime) pairs of makepy support files that are known to
+# provide the custom attribute access in this process.
+_verified = set()
+
 
 def ComsolUtil(version, rebuild):
     """
@@ -38,14 +41,40 @@ def ComsolUtil(version, rebuild):
             .format(version)
         )
     else:
-        if rebuild or _raises_com_error(cu):
-            _generate_custom_makepy_support(
-                idispatch=cu._oleobj_.QueryInterface(pythoncom.IID_IDispatch)
-            )
-            cu = win32com.client.Dispatch(dispatch=progid)
+        idispatch = cu._oleobj_.QueryInterface(pythoncom.IID_IDispatch)
+        key = _makepy_support_key(idispatch, version)
+        if rebuild or (key not in _verified and _raises_com_error(cu)):
+            _generate_custom_makepy_support(idispatch=idispatch)
+            # Wrap the existing COM object with the regenerated class.
+            cu = win32com.client.Dispatch(dispatch=idispatch)
+            key = _makepy_support_key(idispatch, version)
+        if key is not None:
+            _verified.add(key)
         return cu
 
 
+def _makepy_support_key(idispatch, version):
+    """
+    Return a key that identifies the current makepy support file.
+
+    Args:
+        idispatch (PyIDispatch): The IDispatch interface of the COM
+            object.
+        version (str): The COMSOL version string, e.g. "5.3".
+
+    Returns:
+        tuple: The COMSOL version and the modification time of the
+            makepy support file, or None if the file doesn't exist.
+    """
+    try:
+        mtime = os.path.getmtime(_get_generated_filepath(idispatch))
+    except OSError:
+        return None
+    else:
+        return (version, mtime)
+
+
+@functools.lru_cache(maxsize=None)
 def _build_progid(objtype, version):
     """
     Build a ProgID that is known by the ComsolCom interface.
@@ -92,9 +121,9 @@ def _generate_custom_makepy_support(idispatch):
             object.
     """
     module = _generate_typelib_support(idispatch)
-    for name, obj in module.__dict__.items():
-        if _is_makepy_generated_public_class(name, obj):
-            obj.__getattribute__ = __getattribute__
+    for cls in module.CLSIDToClassMap.values():
+        if _is_makepy_generated_public_class(cls):
+            cls.__getattribute__ = __getattribute__
 
 
 def _generate_typelib_support(idispatch):
@@ -127,22 +156,19 @@ def _get_typelib(idispatch):
     return typelib
 
 
-def _is_makepy_generated_public_class(name, obj):
+def _is_makepy_generated_public_class(cls):
     """
-    Return True if the object is a makepy generated public class.
+    Return True if the class is a makepy generated public class.
 
     Args:
-        name (str): The name of the object.
-        obj: The object to test.
+        cls (type): A class of the makepy generated module.
 
     Returns:
-        bool: True if the object is a makepy generated public class,
+        bool: True if the class is a makepy generated public class,
             False otherwise.
     """
-    return (not name.startswith("_")
-            and inspect.isclass(obj)
-            and issubclass(obj, win32com.client.DispatchBaseClass)
-            and not name == "DispatchBaseClass")
+    return (not cls.__name__.startswith("_")
+            and issubclass(cls, win32com.client.DispatchBaseClass))
 
 
 def __getattribute__(self, name):
@@ -169,26 +195,25 @@ def _intercept_method_call(method):
     Returns:
         method: The wrapped method object.
     """
-    @functools.wraps(method)
     def wrapper(*args, **kwargs):
         try:
             retval = method(*args, **kwargs)
         except pythoncom.com_error as e:
             raise error.APIError(e)
         else:
-            log.debug(
-                "Called API function {name}, args={args}, kwargs={kwargs}, "
-                "retval={retval}".format(
-                    name="{cls}.{meth}".format(
-                        cls=method.__self__.__class__.__name__,
-                        meth=method.__name__,
-                    ),
-                    args=args,
-                    kwargs=kwargs,
-                    retval=retval,
+            if log.isEnabledFor(logging.DEBUG):  # Skip formatting otherwise.
+                log.debug(
+                    "Called API function %s.%s, args=%s, kwargs=%s, "
+                    "retval=%s",
+                    method.__self__.__class__.__name__,
+                    method.__name__,
+                    args,
+                    kwargs,
+                    retval,
                 )
-            )
             return retval
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
     return wrapper
 
 
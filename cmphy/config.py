@@ -13,7 +13,8 @@ VERSION = "5.3"
 TIMEOUT = 60
 
 #: Wether to send log messages at the DEBUG level or higher to the
-#: console.
+#: console. Changes take effect immediately, no need to reconfigure
+#: logging.
 DEBUG = False
 
 
@@ -72,13 +73,18 @@ _LOGGING = {
 }
 
 
-def configure_logging(config=None):
+def configure_logging(config=None, debug=None):
     """
     Configure logging for cmphy using the given dictionary.
 
     Args:
         config (dict, optional): The logging configuration to use. Use
             a default configuration if `config` is None.
+        debug (bool, optional): Set the `DEBUG` option to the given
+            value. Keep the current value if `debug` is None.
     """
+    global DEBUG
+    if debug is not None:
+        DEBUG = bool(debug)
     config = _LOGGING if config is None else config
     logging.config.dictConfig(config)
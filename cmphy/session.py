@@ -2,6 +2,7 @@
 This module provides connection capabilities to COMSOL.
 """
 
+import functools
 import logging
 import os
 import subprocess
@@ -17,6 +18,18 @@ from . import error
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+# Bounds (in seconds) of the exponential backoff used to poll the server
+# while waiting for a COMSOL desktop.
+_POLL_DELAY_MIN = 0.05
+_POLL_DELAY_MAX = 0.5
+
+# Time limit in seconds to wait for a terminated COMSOL process to exit,
+# before it is killed. Independent of the connection timeout.
+_TERMINATE_TIMEOUT = 60
+
+# Process name of the COMSOL Multiphysics server.
+_SERVER_NAME = "comsolmphserver.exe"
+
 
 class Session:
 
@@ -34,8 +47,8 @@ class Session:
 
     Args:
         version (str, optional): The COMSOL version to be started.
-        timeout (int, optional): The time limit in seconds after which the
-            connection attempt to COMSOL is aborted.
+        timeout (float, optional): The time limit in seconds after which
+            the connection attempt to COMSOL is aborted.
         rebuild (bool, optional): Wether to rebuild the Python source code
             for the ComsolCom interface.
 
@@ -70,11 +83,13 @@ class Session:
     def __init__(self, version=config.VERSION, timeout=config.TIMEOUT,
                  rebuild=False):
         self._version = str(version)
-        self._timeout = int(timeout)
+        self._timeout = float(timeout)
         self._rebuild = bool(rebuild)
+        self._server_version = None
         self._port = None
         self._server = None
         self._desktop = None
+        self._desktop_proc = None
         self._mphfile = None
         self._model = None
 
@@ -93,6 +108,13 @@ class Session:
         """IModelUtil: A handle to the ModelUtil object."""
         return self._mu
 
+    @property
+    def server_version(self):
+        """str: The full version string of the COMSOL server."""
+        if self._server_version is None:
+            self._server_version = self._cu.get_version()
+        return self._server_version
+
     @property
     def port(self):
         """int: The port number of the COMSOL server."""
@@ -102,8 +124,7 @@ class Session:
         """Start the COMSOL Multiphysics server in non-graphics mode."""
         if self._cu.StartComsolServer(usegraphics=False):
             self._port = int(self._cu.get_port())
-            conn = self._get_server_connection()
-            self._server = psutil.Process(conn.pid)
+            self._server = self._get_server_process()
             log.info(
                 "COMSOL {} server started listening on port {}"
                 .format(self._version, self.port)
@@ -116,20 +137,32 @@ class Session:
                 )
             )
 
-    def _get_server_connection(self):
-        """Get the socket connection that is used by the COMSOL server."""
-        for c in psutil.net_connections():
-            if (c.laddr.port == self.port and c.status == psutil.CONN_LISTEN):
-                log.debug(
-                    "Found socket connection listening on port {}, conn={}"
-                    .format(self.port, c)
-                )
-                return c
-        else:
-            raise error.ConnectionError(
-                "Couldn't find socket connection listening on port {}."
-                .format(self.port)
-            )
+    def _get_server_process(self):
+        """
+        Get the COMSOL server process that listens to the server port.
+
+        Only the sockets of running COMSOL server processes are searched,
+        instead of all socket connections on the system.
+        """
+        for proc in psutil.process_iter(attrs=["name"]):
+            if proc.info["name"] != _SERVER_NAME:
+                continue
+            try:
+                conns = proc.connections(kind="tcp")
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            for c in conns:
+                if (c.laddr.port == self.port
+                        and c.status == psutil.CONN_LISTEN):
+                    log.debug(
+                        "Found socket connection listening on port {}, "
+                        "pid={}, conn={}".format(self.port, proc.pid, c)
+                    )
+                    return proc
+        raise error.ConnectionError(
+            "Couldn't find socket connection listening on port {}."
+            .format(self.port)
+        )
 
     def _connect_client(self):
         """Connect the Python client to the running server."""
@@ -146,6 +179,27 @@ class Session:
                 .format(self.port)
             )
 
+    def _disconnect_client(self):
+        """Disconnect the Python client from the server."""
+        try:
+            self.mu.Disconnect()
+        except error.APIError:
+            return
+        else:
+            log.info("Python client disconnected from the server")
+
+    def reconnect(self):
+        """
+        Reconnect the Python client to the COMSOL server.
+
+        Reuse the running server process. Start a new server only if the
+        previous one is no longer running.
+        """
+        self._disconnect_client()
+        if self._server is None or not self._server.is_running():
+            self._start_server()
+        self._connect_client()
+
     def launch(self, filepath=None):
         """
         Launch a COMSOL desktop that is connected to the running server.
@@ -164,6 +218,12 @@ class Session:
 
         Returns:
             Model: The launched COMSOL Multiphysics model.
+
+        Raises:
+            ConnectionError: If the COMSOL desktop exited before it was
+                connected to the server.
+            TimeoutError: If the COMSOL desktop couldn't be connected to
+                the server within the time limit.
         """
         self._terminate_desktop()
         otags = set(self.mu.tags())
@@ -194,8 +254,10 @@ class Session:
         root_dir = _get_root_dir(self._version)
         cmd = [os.path.join(root_dir, "bin\\win64\\comsol.exe")]
         cmd.extend(options)
-        proc = subprocess.Popen(cmd)
-        self._desktop = psutil.Process(proc.pid)
+        self._desktop_proc = subprocess.Popen(cmd)
+        # The psutil handle must be created while the process is still
+        # alive, otherwise it can't be queried after the process exited.
+        self._desktop = psutil.Process(self._desktop_proc.pid)
         log.debug(
             "Started COMSOL desktop client, pid={}, cmd={}"
             .format(self._desktop.pid, cmd)
@@ -232,9 +294,19 @@ class Session:
         Returns:
             Model: The launched COMSOL Multiphysics model.
         """
+        ftags = set()  # The new model tags that refer to the MPH-file.
+        delay = _POLL_DELAY_MIN
         start_time = time.time()
         while time.time() - start_time < self._timeout:
-            time.sleep(1)
+            time.sleep(delay)
+            delay = min(delay * 1.5, _POLL_DELAY_MAX)
+            returncode = self._desktop_proc.poll()
+            if returncode is not None:
+                self._terminate_desktop()
+                raise error.ConnectionError(
+                    "COMSOL desktop exited unexpectedly with exit code {}."
+                    .format(returncode)
+                )
             try:
                 dtags = set(self.mu.tags()).difference(tags)
                 log.debug(
@@ -253,7 +325,7 @@ class Session:
                     assert len(dtags) == 1, msg
                     ftag = dtags.pop()
                 else:
-                    for tag in dtags:
+                    for tag in dtags.difference(ftags):
                         try:
                             filepath = self.mu.Model(tag).getFilePath()
                         except error.APIError as e:  # Server is busy.
@@ -261,15 +333,15 @@ class Session:
                             continue
                         else:
                             if filepath == self._mphfile:
-                                ftag = tag
-                            else:
+                                ftags.add(tag)
+                            else:  # Tag may be reused, so don't remember it.
                                 self.mu.remove(tag)
                                 log.debug(
                                     "Removed 'intermediate' model tagged "
                                     "{!r} from server".format(tag)
                                 )
+                    ftag = next(iter(dtags.intersection(ftags)), None)
                 if ftag is not None:
-                    time.sleep(3)
                     try:
                         self._model = self.mu.Model(ftag)
                     except error.APIError:  # Strange!? Might happen when an
@@ -288,7 +360,7 @@ class Session:
         else:
             self._terminate_desktop()
             raise error.TimeoutError(
-                "Couldn't establish a connection to the desktop within {} "
+                "Couldn't establish a connection to the desktop within {:g} "
                 "seconds. Connection attempt aborted."
                 .format(self._timeout)
             )
@@ -300,7 +372,7 @@ class Session:
 
     def _terminate_desktop(self):
         """Terminate the COMSOL Multiphysics desktop process."""
-        self._terminate_process(self._desktop)
+        self._terminate_subprocess(self._desktop_proc)
         self._remove_active_model()
         self._remove_lock_file()
 
@@ -312,20 +384,46 @@ class Session:
             proc (psutil.Process): The COMSOL process to be terminated.
         """
         try:
-            pid = proc.pid
             name = proc.name()
             proc.terminate()
         except (AttributeError, psutil.NoSuchProcess):
             return
         else:
-            msg = "COMSOL process {}, pid={}".format(name, pid)
-            try:
-                proc.wait(timeout=self._timeout)
-            except psutil.TimeoutExpired:
-                proc.kill()
-                log.debug("Killed {}".format(msg))
-            else:
-                log.debug("Terminated {}".format(msg))
+            self._wait_or_kill(proc, name, psutil.TimeoutExpired)
+
+    def _terminate_subprocess(self, proc):
+        """
+        Safely terminate the given COMSOL Multiphysics child process.
+
+        Args:
+            proc (subprocess.Popen): The COMSOL process to be terminated.
+        """
+        if proc is None or proc.poll() is not None:
+            return
+        proc.terminate()
+        name = os.path.basename(proc.args[0])
+        self._wait_or_kill(proc, name, subprocess.TimeoutExpired)
+
+    def _wait_or_kill(self, proc, name, timeout_error):
+        """
+        Wait for a terminated COMSOL process to exit, kill it on timeout.
+
+        Args:
+            proc (psutil.Process or subprocess.Popen): The terminated
+                COMSOL process.
+            name (str): The name of the COMSOL process.
+            timeout_error (type): The exception raised by `proc.wait` on
+                timeout.
+        """
+        msg = "COMSOL process {}, pid={}".format(name, proc.pid)
+        try:
+            proc.wait(timeout=_TERMINATE_TIMEOUT)
+        except timeout_error:
+            proc.kill()
+            proc.wait()
+            log.debug("Killed {}".format(msg))
+        else:
+            log.debug("Terminated {}".format(msg))
 
     def _remove_active_model(self):
         """
@@ -380,21 +478,40 @@ def _get_root_dir(version):
         str: The COMSOL root directory.
 
     Raises:
-        ValueError: If the COMSOL root directory couldn't be found.
+        VersionError: If the COMSOL root directory couldn't be found.
+    """
+    root_dir = _query_root_dir(str(version))
+    if root_dir is None:
+        raise error.VersionError(
+            "Couldn't find root directory of COMSOL version {!r}. Please "
+            "check if the requested version of COMSOL is installed."
+            .format(version)
+        )
+    return root_dir
+
+
+@functools.lru_cache(maxsize=8)
+def _query_root_dir(version):
+    """
+    Query the COMSOL root directory from the Windows registry.
+
+    The result is cached, including the case of an unknown version.
+
+    Args:
+        version (str): The COMSOL version string, e.g. "5.3".
+
+    Returns:
+        str: The COMSOL root directory, or None if it couldn't be found.
     """
     try:
         hkey = winreg.OpenKeyEx(
             key=winreg.HKEY_LOCAL_MACHINE,
             sub_key="SOFTWARE\\COMSOL\\COMSOL{}".format(
-                str(version).replace(".", "")
+                version.replace(".", "")
             )
         )
     except OSError:
-        raise error.VersionError(
-            "Couldn't find root directory of COMSOL version {!r}. Please "
-            "check if the requested version of COMSOL is installed."
-            .format(version)
-        )
+        return None
     else:
         value, __ = winreg.QueryValueEx(hkey, "COMSOLROOT")
         log.debug(
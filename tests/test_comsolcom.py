@@ -1,5 +1,7 @@
+import gc
 import os
 import types
+import weakref
 
 import pytest
 import pythoncom
@@ -53,6 +55,20 @@ def test_existing_makepy_support_is_reused():
     assert mtime == os.path.getmtime(filepath)
 
 
+def test_makepy_support_is_verified_once(monkeypatch):
+    version = config.VERSION
+    _comsolcom.ComsolUtil(version, rebuild=False)
+
+    def fail(cu):
+        pytest.fail("makepy support was verified again")
+
+    monkeypatch.setattr(_comsolcom, "_raises_com_error", fail)
+    cu = _comsolcom.ComsolUtil(version, rebuild=False)
+
+    with pytest.raises(error.APIError):
+        cu.StartComsolServer()
+
+
 def test_custom_attribute_access():
     version = config.VERSION
     cu = _comsolcom.ComsolUtil(version, rebuild=True)
@@ -62,3 +78,17 @@ def test_custom_attribute_access():
     assert type(cu.coclass_clsid) is pywintypes.IIDType
     assert type(cu._get_good_object_) is types.MethodType
     assert type(cu.__dict__) is dict
+
+
+def test_custom_attribute_access_creates_no_reference_cycle():
+    version = config.VERSION
+    cu = _comsolcom.ComsolUtil(version, rebuild=False)
+
+    gc.disable()
+    try:
+        cu.get_port
+        ref = weakref.ref(cu)
+        del cu
+        assert ref() is None
+    finally:
+        gc.enable()
@@ -0,0 +1,21 @@
+import logging
+
+from cmphy import config
+
+
+def test_configure_logging_sets_debug():
+    debug = config.DEBUG
+    try:
+        config.configure_logging(debug=True)
+        assert config.DEBUG is True
+
+        logger = logging.getLogger("cmphy")
+        handler, = [h for h in logger.handlers if h.name == "console_debug"]
+        record = logging.makeLogRecord({"name": "cmphy", "msg": "test"})
+        assert handler.filter(record)
+
+        # Changes take effect without reconfiguring logging.
+        config.DEBUG = False
+        assert not handler.filter(record)
+    finally:
+        config.DEBUG = debug
@@ -1,11 +1,33 @@
+import contextlib
+import gc
 import os
+import re
+import subprocess
+import sys
+import threading
 
+import psutil
 import pytest
+import watchdog.events
+import watchdog.observers
 
 from cmphy import config
 from cmphy import error
 from cmphy import session
 
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_MPH_FILES = tuple(
+    os.path.join(_MODULE_DIR, "models", filename)
+    for filename in ["session-1.mph", "session-2.mph"]
+)
+_LOCK_FILES = tuple(filepath + ".lock" for filepath in _MPH_FILES)
+
+_RE_UNKNOWN_VERSION = re.compile(r"COMSOL version '1\.0\.99'")
+_RE_EMPTY_VERSION = re.compile(r"COMSOL version ''")
+_RE_ALREADY_CONNECTED = re.compile(r"already connected to the server")
+_RE_DESKTOP_EXITED = re.compile(r"desktop exited unexpectedly")
+_RE_TIMED_OUT = re.compile(r"connection to the desktop within 0\.1 seconds")
+
 
 def test_get_root_dir():
     version = config.VERSION
@@ -13,130 +35,208 @@ def test_get_root_dir():
         root_dir = session._get_root_dir(version)
         assert os.path.isdir(root_dir)
 
-    with pytest.raises(error.VersionError):
+    with pytest.raises(error.VersionError, match=_RE_UNKNOWN_VERSION):
         root_dir = session._get_root_dir(version="1.0.99")
 
-    with pytest.raises(error.VersionError):
+    with pytest.raises(error.VersionError, match=_RE_EMPTY_VERSION):
         root_dir = session._get_root_dir(version="")
 
 
+@pytest.fixture(scope="class")
+def shared_session():
+    ses = session.Session()
+    yield ses
+    ses.shutdown()
+
+
+@pytest.fixture
+def ses(shared_session):
+    tags = set(shared_session.mu.tags())
+    yield shared_session
+    shared_session._terminate_desktop()
+    for tag in set(shared_session.mu.tags()).difference(tags):
+        shared_session.mu.remove(tag)
+
+
+@pytest.fixture
+def seeded_model(ses):
+    model = ses.mu.create("Model1")
+    yield model
+    ses.mu.remove(model.get_tag())
+
+
 class TestSession:
 
-    def test_server_only_session(self):
-        ses = session.Session()
+    def test_server_only_session(self, ses, seeded_model):
+        mu, server = ses.mu, ses._server
 
         assert hasattr(ses._cu, "StartComsolServer")
-        assert ses._version in ses._cu.get_version()
+        assert ses._version in ses.server_version
         assert ses._port == ses._cu.get_port()
 
-        assert hasattr(ses.mu, "tags")
+        assert hasattr(mu, "tags")
         with pytest.raises(AttributeError):
             ses.mu = None
 
-        assert ses._server.is_running()
-        assert ses._server.name() == "comsolmphserver.exe"
+        assert server.is_running()
+        assert server.name() == "comsolmphserver.exe"
 
-        model = ses.mu.create("Model1")
-        assert model.get_tag() in ses.mu.tags()
+        model = seeded_model
+        assert model.get_tag() in mu.tags()
         assert model_is_ready_for_use(model)
 
-        ses.shutdown()
+    def test_model_lifecycle(self, ses):
+        mu = ses.mu
 
-        assert not ses._server.is_running()
+        tag = mu.uniquetag("Model")
+        model = mu.create(tag)
+        assert tag in mu.tags()
+        assert model_is_ready_for_use(model)
 
-    def test_session_with_desktop(self):
-        modulepath = os.path.dirname(__file__)
-        filepaths = [
-            os.path.join(modulepath, "models", filename)
-            for filename in ["session-1.mph", "session-2.mph"]
-        ]
+        mu.remove(tag)
+        assert tag not in mu.tags()
 
-        ses = session.Session()
-        model = ses.mu.load(tag="Session1", filename=filepaths[0])
-        assert model.get_tag() in ses.mu.tags()
-        assert model_is_ready_for_use(model)
+    @pytest.mark.parametrize(
+        "mphfile, lockfile",
+        [(None, None), *zip(_MPH_FILES, _LOCK_FILES), (None, None)],
+        ids=["empty1", "file1", "file2", "empty2"],
+    )
+    def test_session_with_desktop(self, ses, mphfile, lockfile):
+        mu = ses.mu
 
-        # ------------------ Launch an empty COMSOL desktop ------------------
+        model = mu.load(tag="Session1", filename=_MPH_FILES[0])
+        assert model.get_tag() in mu.tags()
+        assert model_is_ready_for_use(model)
 
-        model = ses.launch()
+        model = ses.launch(mphfile)
+        desktop = ses._desktop
 
-        assert ses._desktop.is_running()
+        assert desktop.is_running()
         assert ses._model is not None
-        assert model.getFilePath() == ""
-        assert ses._mphfile is None
+        assert ses._mphfile == mphfile
+        assert model.getFilePath() == ("" if mphfile is None else mphfile)
+        if lockfile is not None:
+            assert wait_for_file(lockfile, exists=True)
 
         tag = model.get_tag()
-        assert tag in ses.mu.tags()
+        tags = frozenset(mu.tags())
+        assert tag in tags and "Session1" in tags
         assert model_is_ready_for_use(model)
 
         ses._terminate_desktop()
 
-        assert not ses._desktop.is_running()
-        assert tag not in ses.mu.tags()
+        assert process_stopped(desktop)
+        tags = frozenset(mu.tags())
+        assert tag not in tags and "Session1" in tags
+        if lockfile is not None:
+            assert wait_for_file(lockfile, exists=False)
 
-        # --- Launch two COMSOL desktops (sequentially) with opened models ---
+    def test_desktop_exited_early(self, ses, monkeypatch):
+        popen = subprocess.Popen
 
-        for filepath in filepaths:
-            model = ses.launch(filepath)
+        def start_short_lived_process(cmd):
+            return popen([sys.executable, "-c", "import time; time.sleep(1)"])
 
-            assert model.getFilePath() == filepath
-            lockfile = ses._mphfile + ".lock"
-            assert os.path.isfile(lockfile)
+        monkeypatch.setattr(subprocess, "Popen", start_short_lived_process)
 
-            tag = model.get_tag()
-            assert tag in ses.mu.tags()
-            assert model_is_ready_for_use(model)
+        with pytest.raises(error.ConnectionError, match=_RE_DESKTOP_EXITED):
+            ses.launch()
 
-            ses._terminate_desktop()
+        assert process_stopped(ses._desktop)
 
-            assert not ses._desktop.is_running()
-            assert not os.path.isfile(lockfile)
-            assert tag not in ses.mu.tags()
 
-        # -------------- Again, launch an empty COMSOL desktop --------------
+# The following tests need their own session and must run after the shared
+# session of `TestSession` has been shut down.
 
-        model = ses.launch()
+def test_multiple_connections():
+    ses = session.Session()
 
-        tag = model.get_tag()
-        assert tag in ses.mu.tags()
-        assert model_is_ready_for_use(model)
+    with pytest.raises(error.AlreadyConnectedError,
+                       match=_RE_ALREADY_CONNECTED):
+        session.Session()
 
-        assert model.getFilePath() == ""
+    # The failed session started a server of its own, which listens on
+    # another port because the port of the first server is still taken.
+    # It has shut that server down already; collect it now, so that its
+    # __del__ doesn't run later on during the checks below.
+    gc.collect()
 
-        ses.shutdown()
+    server = ses._server
+    ses.reconnect()
 
-        assert not ses._desktop.is_running()
-        assert not ses._server.is_running()
+    assert ses._server is server
+    assert server.is_running()
+    assert model_is_ready_for_use(ses.mu.create("Model1"))
 
-    def test_multiple_connections(self):
-        ses = session.Session()
+    ses.shutdown()
 
-        with pytest.raises(error.AlreadyConnectedError):
-            session.Session()
+    assert process_stopped(server)
 
-        ses.shutdown()
-        ses = session.Session()
+    ses.reconnect()
 
-        assert ses._server.is_running()
+    assert ses._server is not server
+    assert ses._server.is_running()
 
-        ses.shutdown()
+    ses.shutdown()
 
-    def test_connection_attempt_timed_out(self):
-        ses = session.Session(timeout=1)
+    assert process_stopped(ses._server)
 
-        with pytest.raises(error.TimeoutError):
+
+@pytest.mark.timeout(60)
+def test_connection_attempt_timed_out():
+    ses = session.Session(timeout=0.1)
+
+    try:
+        with pytest.raises(error.TimeoutError, match=_RE_TIMED_OUT):
             ses.launch()
 
-        assert not ses._desktop.is_running()
+        assert process_stopped(ses._desktop)
+    finally:
+        ses.shutdown()
 
 
 def model_is_ready_for_use(model):
-    try:
+    with contextlib.suppress(error.APIError):
         name, value = "length", "1[cm]"
-        model.param().set(name, value)
-        assert model.param().get(name) == value
-        model.param().remove(name)
-    except error.APIError:
-        return False
-    else:
+        param = model.param()
+        param.set(name, value)
+        ok = param.get(name) == value
+        param.remove(name)
+        return ok
+    return False
+
+
+def process_stopped(proc, timeout=5):
+    gone, alive = psutil.wait_procs([proc], timeout=timeout)
+    return not alive
+
+
+def wait_for_file(path, exists=True, timeout=5):
+    if file_exists(path) == exists:
         return True
+
+    ready = threading.Event()
+
+    class Handler(watchdog.events.FileSystemEventHandler):
+        def on_any_event(self, event):
+            if file_exists(path) == exists:
+                ready.set()
+
+    observer = watchdog.observers.Observer()
+    observer.schedule(Handler(), os.path.dirname(path))
+    observer.start()
+    try:
+        # The file might have changed before the observer was started.
+        return file_exists(path) == exists or ready.wait(timeout)
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def file_exists(path):
+    return os.path.basename(path) in _dir_entries(os.path.dirname(path))
+
+
+def _dir_entries(path):
+    with os.scandir(path) as entries:
+        return frozenset(entry.name for entry in entries)